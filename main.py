@@ -1,11 +1,175 @@
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import pandas as pd
+import asyncio
+import hashlib
 import io
 import json
 import logging
+import os
+import tempfile
+from collections import OrderedDict
 
-app = FastAPI()
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+from joblib import Parallel, delayed
+
+from src.core.remediator import DataRemediator
+from src.modeling.baseline import BaselineModeler
+from src.modeling.neural_arena import NeuralArena
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Bounded LRU of heavy per-upload artifacts (parsed frame, null counts,
+# healed frame), keyed by content hash. Re-submitting the same CSV with a
+# different target/feature selection then skips parse+diagnose+impute.
+# Disable with CORTEX_UPLOAD_CACHE=0 if memory is tight.
+UPLOAD_CACHE_ENABLED = os.environ.get("CORTEX_UPLOAD_CACHE", "1") != "0"
+UPLOAD_CACHE_MAX = 8
+_upload_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+def upload_cache_entry(digest: str) -> dict:
+    """Return the (possibly empty) cache entry for a content hash, evicting LRU."""
+    if not UPLOAD_CACHE_ENABLED:
+        return {}
+    if digest in _upload_cache:
+        _upload_cache.move_to_end(digest)
+    else:
+        _upload_cache[digest] = {}
+        while len(_upload_cache) > UPLOAD_CACHE_MAX:
+            _upload_cache.popitem(last=False)
+    return _upload_cache[digest]
+
+async def spool_upload_to_disk(upload: UploadFile) -> tuple:
+    """
+    Stream an UploadFile to a named temp file; return (path, content hash).
+
+    Reads in 1MB chunks with the async UploadFile API so the event loop can
+    service other requests between chunks, instead of one blocking copy of
+    the whole upload; the hash is folded in per chunk so the upload is never
+    re-read. Caller is responsible for unlinking the path.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tf:
+        while chunk := await upload.read(1 << 20):
+            tf.write(chunk)
+            hasher.update(chunk)
+        return tf.name, hasher.hexdigest()
+
+def read_csv_upload(path: str) -> pd.DataFrame:
+    """
+    Parse a CSV file on disk into a DataFrame.
+
+    Uses pyarrow's multithreaded CSV reader when available (pandas' read_csv
+    is single-threaded), falling back to pandas otherwise.
+    """
+    if pacsv is not None:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+        )
+        return table.to_pandas()
+    return pd.read_csv(path)
+
+
+def preview_records(df: pd.DataFrame, n: int = 10) -> list:
+    """
+    First n rows as a list of plain dicts for the JSON response.
+
+    Arrow's to_pylist does the row conversion in C in bulk; the pandas
+    fallback round-trips through to_json, which is still far cheaper than
+    to_dict's per-cell boxing.
+    """
+    head = df.head(n)
+    if pa is not None:
+        return pa.Table.from_pandas(head, preserve_index=False).to_pylist()
+    return json.loads(head.to_json(orient="records"))
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float64 -> float32 and shrink int64 columns in place.
+
+    Every later scan (isnull, nunique, model fit) is memory-bound, so halving
+    the bytes per numeric cell roughly doubles its throughput; sklearn's
+    trees run in float32 anyway.
+    """
+    for col, dt in df.dtypes.items():
+        if dt == 'float64':
+            df[col] = df[col].astype('float32')
+        elif dt == 'int64':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def parallel_smart_impute(df: pd.DataFrame, target_col: str) -> pd.DataFrame:
+    """
+    Impute wide frames in parallel column blocks.
+
+    The median/mode fills treat every column independently, so that work is
+    embarrassingly parallel: split the columns into one block per core,
+    heal each block in a thread, and stitch the results back together.
+    Narrow frames fall through to the plain call — as do frames where the
+    KNN path would engage, since the neighbor search ranks donors across
+    the whole numeric block (per-block slices would impute differently)
+    and already runs its own FAISS/numba thread pool. Sharded calls pass
+    allow_knn=False so a block whose own slice happens to clear the KNN
+    gates (e.g. missingness concentrated in its columns) still takes the
+    median fill the sequential path would have used.
+    """
+    n_cols = df.shape[1]
+    workers = os.cpu_count() or 1
+    if workers < 2 or n_cols < 32 or DataRemediator.knn_eligible(df):
+        return DataRemediator.smart_impute(df, target_col)
+
+    block = -(-n_cols // workers)  # ceil division
+    healed_blocks = Parallel(n_jobs=workers, prefer='threads')(
+        delayed(DataRemediator.smart_impute)(df.iloc[:, i:i + block], target_col, allow_knn=False)
+        for i in range(0, n_cols, block)
+    )
+    return pd.concat(healed_blocks, axis=1)
+
+def build_schema(df: pd.DataFrame) -> dict:
+    """
+    Partition columns into numeric vs categorical with one pass over dtypes,
+    instead of two select_dtypes calls (each of which scans all dtypes and
+    allocates a projected DataFrame just to read .columns).
+    """
+    numeric, categorical = [], []
+    for col, dt in df.dtypes.items():
+        if dt.kind in 'iufc':
+            numeric.append(col)
+        elif dt.kind == 'O' or dt == 'str':
+            categorical.append(col)
+    return {"numeric": numeric, "categorical": categorical}
+
+def fast_nunique(series: pd.Series, total_rows: int) -> int:
+    """
+    Cardinality with a cheap short-circuit: strictly increasing numeric columns
+    (IDs, timestamps, row numbers) are unique by construction, so skip the
+    full hash-based nunique() and count non-nulls instead.
+    """
+    if pd.api.types.is_numeric_dtype(series) and series.is_monotonic_increasing:
+        non_null = series.dropna()
+        # Strictly increasing (diff > 0 everywhere) => every value is distinct
+        if len(non_null) > 1 and (non_null.diff().iloc[1:] > 0).all():
+            return len(non_null)
+    return int(series.nunique())
+
+@app.on_event("startup")
+async def warm_model_path():
+    # First call into sklearn/shap pays multi-hundred-ms of lazy import and
+    # internal compilation; run a tiny model once so real requests don't.
+    dummy = pd.DataFrame({
+        "x": list(range(10)),
+        "y": [0, 1] * 5
+    })
+    schema = {"numeric": ["x"], "categorical": []}
+    await asyncio.to_thread(BaselineModeler.run_baseline_model, dummy, "y", schema, True)
 
 # Add CORS
 app.add_middleware(
@@ -22,11 +186,27 @@ async def heal_data(
     target_column: str = Form(None)  # ADD THIS LINE
 ):
     try:
-        # 1. READ FILE
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        # 1. READ FILE (spool to disk so the parser reads the file directly
+        # instead of a second in-memory copy of the upload); re-submissions
+        # of the same bytes reuse the cached parse.
+        csv_path, digest = await spool_upload_to_disk(file)
+        try:
+            cache = upload_cache_entry(digest)
+            if "df" not in cache:
+                parsed = await asyncio.to_thread(read_csv_upload, csv_path)
+                cache["df"] = downcast_numeric(parsed)
+            df = cache["df"]
+        finally:
+            os.unlink(csv_path)
         total_rows = len(df)
-        
+
+        # Null scan is O(rows*cols); compute it ONCE and reuse everywhere below
+        # (diagnostics, missing_before, health_data) instead of re-materializing
+        # the boolean mask three times.
+        if "null_counts" not in cache:
+            cache["null_counts"] = df.isnull().sum()
+        null_counts = cache["null_counts"]
+
         # 2. RESOLVE TARGET COLUMN - MODIFY THIS SECTION
         # If frontend sent a target, use it. Otherwise, default to the last column.
         if target_column and target_column in df.columns:
@@ -49,36 +229,35 @@ async def heal_data(
             chosen_features.remove(target_col)
 
         # 4. GENERATE DIAGNOSTICS (Always based on full dataset)
-        column_diagnostics = []
-        for col in df.columns:
-            unique_count = df[col].nunique()
-            missing_count = int(df[col].isnull().sum())
-            missing_pct = round((missing_count / total_rows) * 100, 1)
-            cardinality_ratio = unique_count / total_rows
-            
-            column_diagnostics.append({
+        # Bulk pandas calls instead of per-column ones, with a short-circuit
+        # for columns that are provably unique-per-row (monotone IDs).
+        nuniques = {col: fast_nunique(df[col], total_rows) for col in df.columns}
+        # Raw dtype array + .kind char compare avoids pandas' rich dtype
+        # __eq__ machinery on every column.
+        dtypes = df.dtypes.to_numpy()
+        column_diagnostics = [
+            {
                 "label": col,
                 "value": col,
-                "cardinality": unique_count,
-                "missing_pct": missing_pct,
-                "type": str(df[col].dtype),
-                "is_noisy": cardinality_ratio > 0.8 and df[col].dtype == 'object'
-            })
+                "cardinality": int(nuniques[col]),
+                "missing_pct": round((int(null_counts[col]) / total_rows) * 100, 1),
+                "type": str(dtypes[i]),
+                "is_noisy": nuniques[col] / total_rows > 0.8 and dtypes[i].kind == 'O'
+            }
+            for i, col in enumerate(df.columns)
+        ]
 
         # 5. SMART HEALING
-        from src.core.remediator import DataRemediator
-        healed_df = DataRemediator.smart_impute(df, target_col)
+        if "healed_df" not in cache:
+            cache["healed_df"] = await asyncio.to_thread(parallel_smart_impute, df, target_col)
+        healed_df = cache["healed_df"]
         
         # 6. MODELING PREPARATION - MODIFY THIS SECTION
         # Build features list + target for modeling
         modeling_cols = chosen_features + [target_col]
-        model_input_df = healed_df[modeling_cols]
+        model_input_df = healed_df.loc[:, modeling_cols]
         
-        from src.modeling.baseline import BaselineModeler
-        schema = {
-            "numeric": model_input_df.select_dtypes(include=['number']).columns.tolist(),
-            "categorical": model_input_df.select_dtypes(include=['object']).columns.tolist()
-        }
+        schema = build_schema(model_input_df)
         
         # Remove target from schema to avoid modeler confusion
         if target_col in schema["numeric"]:
@@ -86,22 +265,24 @@ async def heal_data(
         if target_col in schema["categorical"]:
             schema["categorical"].remove(target_col)
         
-        model_results = BaselineModeler.run_baseline_model(model_input_df, target_col, schema, True)
+        model_results = await asyncio.to_thread(
+            BaselineModeler.run_baseline_model, model_input_df, target_col, schema, True
+        )
 
         # 7. RESPONSE - ADD target_used TO STATS
         return {
             "stats": {
                 "accuracy": model_results.get("accuracy", "N/A"),
-                "missing_before": int(df.isnull().sum().sum()),
+                "missing_before": int(null_counts.sum()),
                 "rows": total_rows,
                 "target_used": target_col  # ADD THIS LINE
             },
             "analysis": {
-                "health_data": {k: int(v) for k, v in df.isnull().sum().to_dict().items() if v > 0},
+                "health_data": {k: int(v) for k, v in null_counts.items() if v > 0},
                 "feature_importance": model_results.get("feature_importance", {}),
                 "column_diagnostics": column_diagnostics 
             },
-            "preview_data": healed_df.head(10).to_dict(orient="records")
+            "preview_data": preview_records(healed_df)
         }
     except Exception as e:
         logging.error(f"Heal error: {str(e)}")
@@ -114,9 +295,18 @@ async def neural_arena(
     target_column: str = Form(None)
 ):
     try:
-        # 1. READ FILE
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
+        # 1. READ FILE (spool to disk so the parser reads the file directly
+        # instead of a second in-memory copy of the upload); re-submissions
+        # of the same bytes reuse the cached parse.
+        csv_path, digest = await spool_upload_to_disk(file)
+        try:
+            cache = upload_cache_entry(digest)
+            if "df" not in cache:
+                parsed = await asyncio.to_thread(read_csv_upload, csv_path)
+                cache["df"] = downcast_numeric(parsed)
+            df = cache["df"]
+        finally:
+            os.unlink(csv_path)
         total_rows = len(df)
         
         # 2. RESOLVE TARGET COLUMN
@@ -140,17 +330,15 @@ async def neural_arena(
             chosen_features.remove(target_col)
 
         # 4. SMART HEALING
-        from src.core.remediator import DataRemediator
-        healed_df = DataRemediator.smart_impute(df, target_col)
+        if "healed_df" not in cache:
+            cache["healed_df"] = await asyncio.to_thread(parallel_smart_impute, df, target_col)
+        healed_df = cache["healed_df"]
         
         # 5. MODELING PREPARATION
         modeling_cols = chosen_features + [target_col]
-        model_input_df = healed_df[modeling_cols]
+        model_input_df = healed_df.loc[:, modeling_cols]
         
-        schema = {
-            "numeric": model_input_df.select_dtypes(include=['number']).columns.tolist(),
-            "categorical": model_input_df.select_dtypes(include=['object']).columns.tolist()
-        }
+        schema = build_schema(model_input_df)
         
         # Remove target from schema
         if target_col in schema["numeric"]:
@@ -159,8 +347,7 @@ async def neural_arena(
             schema["categorical"].remove(target_col)
         
         # 6. RUN NEURAL ARENA
-        from src.modeling.neural_arena import NeuralArena
-        arena_results = NeuralArena.run_arena(model_input_df, target_col, schema)
+        arena_results = await asyncio.to_thread(NeuralArena.run_arena, model_input_df, target_col, schema)
 
         # 7. RESPONSE
         return {
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import List
 
@@ -19,29 +20,32 @@ class BiasAnalyzer:
         DIR = (Rate of Positive Outcome for Unprivileged Group) / (Rate of Positive Outcome for Privileged Group)
         """
         try:
-            # Drop NaNs for a clean count of groups
+            # Drop NaNs for a clean count of groups. Cast the sensitive column
+            # to Categorical so the group comparisons below run on integer
+            # codes instead of per-element PyObject equality.
             df_clean = df[[sensitive_col, target_col]].dropna()
-            
+            groups = df_clean[sensitive_col].astype('category')
+
             # Identify the two main groups (assuming binary sensitive attribute for simplicity)
-            group_counts = df_clean[sensitive_col].value_counts()
+            group_counts = groups.value_counts()
             if len(group_counts) < 2:
                 return {"error": f"Not enough groups for DIR in {sensitive_col}"}
 
             # For the purpose of this analysis, we define the "Privileged" group as the LARGEST group
             # and the "Unprivileged" group as the SMALLEST group.
-            privileged_group = group_counts.index[group_counts.argmax()]
-            unprivileged_group = group_counts.index[group_counts.argmin()]
+            privileged_group = group_counts.idxmax()
+            unprivileged_group = group_counts.idxmin()
 
             # Calculate the positive outcome rate (Selection Rate) for each group
-            # Filter for rows where the target column matches the positive label
-            
-            # Privileged Rate (RP)
-            df_priv = df_clean[df_clean[sensitive_col] == privileged_group]
-            rate_priv = (df_priv[target_col] == positive_label).mean()
-            
-            # Unprivileged Rate (RU)
-            df_unpriv = df_clean[df_clean[sensitive_col] == unprivileged_group]
-            rate_unpriv = (df_unpriv[target_col] == positive_label).mean()
+            # in ONE grouped pass over a uint8 hit column, rather than two
+            # full filter-then-compare scans over the original labels.
+            is_pos = pd.Series(
+                df_clean[target_col].eq(positive_label).to_numpy(np.uint8),
+                index=df_clean.index
+            )
+            rates = is_pos.groupby(groups, observed=True).mean()
+            rate_priv = float(rates[privileged_group])
+            rate_unpriv = float(rates[unprivileged_group])
             
             # Avoid division by zero
             if rate_priv == 0:
@@ -82,8 +86,9 @@ class BiasAnalyzer:
         counts = df[sensitive_col].value_counts(normalize=True).round(4) * 100
         total = len(df)
         
-        min_percent = counts.min()
-        min_group = counts.index[counts.argmin()]
+        # idxmin + scalar lookup: one pass over counts instead of two
+        min_group = counts.idxmin()
+        min_percent = counts.loc[min_group]
         
         severity = "LOW"
         warning = None
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from joblib import Parallel, delayed
 
 class DataHealth:
     """
@@ -36,8 +37,12 @@ class DataHealth:
         Returns:
             dict: A summary dictionary.
         """
-        total_duplicates = df.duplicated().sum()
+        # duplicated() compares rows as tuples; the vectorized row hash plus
+        # one np.unique sort gives the same all-but-first count (len minus
+        # distinct rows) with a single C pass per column.
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
         total_rows = len(df)
+        total_duplicates = int(total_rows - np.unique(hashes).size)
         
         return {
             "total_rows": total_rows,
@@ -53,8 +58,16 @@ class DataHealth:
         Returns:
             pd.DataFrame: A summary table of column cardinality.
         """
-        cardinality = df.nunique()
-        
+        # df.nunique() hashes each column serially; fan the per-column counts
+        # out across threads (nunique releases the GIL in its hash kernels)
+        # so wide frames scale with core count.
+        cardinality = pd.Series(
+            Parallel(n_jobs=-1, prefer='threads')(
+                delayed(pd.Series.nunique)(df[col]) for col in df.columns
+            ),
+            index=df.columns
+        )
+
         cardinality_df = pd.DataFrame({
             'Unique Values': cardinality
         }).sort_values(by='Unique Values', ascending=False)
@@ -80,10 +93,19 @@ class DataHealth:
             # Note: We convert to_dict() for easy serialization/passing to Streamlit later
             # Return nested dicts keyed by column name so downstream code can
             # index into e.g. missing_data['Missing Percent'][col_name]
+            cardinality_df = DataHealth.get_column_cardinality(df)
+            cardinality = cardinality_df.to_dict()
+            # Packed companions to the per-column dicts (underscore-prefixed
+            # so renderers skip them): the scorer reduces these with single
+            # C-level comparisons instead of walking the nested dicts.
+            cardinality['_unique_counts'] = cardinality_df['Unique Values'].to_numpy(dtype=np.int64)
+            cardinality['_id_flags'] = (
+                cardinality_df['Cardinality Flag'].to_numpy() == 'High (Potential ID)'
+            ).astype(np.uint8)
             return {
                 "missing_data": DataHealth.get_missing_data_summary(df).to_dict(),
                 "duplicate_summary": DataHealth.get_duplicate_summary(df),
-                "cardinality": DataHealth.get_column_cardinality(df).to_dict()
+                "cardinality": cardinality
             }
         except Exception as e:
             # 🚨 CRITICAL FIX: Always return a dictionary on failure with safe defaults
@@ -1,52 +1,100 @@
 from typing import Dict, List, Any
+import csv
+import numpy as np
 import pandas as pd
 import io
-from collections import Counter # Keep this for robust duplicate counting
+
+try:
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
 
 class DataLoader:
     """
     Handles secure loading and initial validation of CSV datasets.
     """
-    
+
+    # Buffers larger than this are read in streamed chunks so peak memory
+    # stays ~chunk-sized instead of ~2x file size.
+    STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
     @staticmethod
-    def load_file(file_buffer) -> pd.DataFrame:
+    def _buffer_size(file_buffer) -> int:
+        """Byte size of a seekable buffer, or 0 when it cannot be determined."""
+        try:
+            pos = file_buffer.tell()
+            size = file_buffer.seek(0, 2)
+            file_buffer.seek(pos)
+            return size
+        except Exception:
+            return 0
+
+    @staticmethod
+    def load_file(file_buffer, chunksize: int = 500_000) -> pd.DataFrame:
         """
         Reads a CSV file buffer into a Pandas DataFrame with strict validation.
-        
+
         ... (omitted docstring for brevity) ...
         """
         try:
             # --- Preparation: Reset file pointer ---
             if hasattr(file_buffer, 'seek'):
                 file_buffer.seek(0)
-            
-            # 1. Read the file without using the header row initially (header=None)
-            # This allows us to check the raw header before Pandas renames it.
-            temp_df = pd.read_csv(file_buffer, header=None)
-            
-            if temp_df.empty:
+
+            # 1. Peek ONLY the header line to check for duplicate column names
+            # (pandas silently mangles them to 'col.1' otherwise). This is
+            # O(1 row) instead of re-reading the whole file with header=None.
+            header_line = file_buffer.readline()
+            if isinstance(header_line, bytes):
+                header_line = header_line.decode('utf-8', errors='replace')
+            if not header_line.strip():
                 raise ValueError("The uploaded dataset is empty.")
 
-            # Extract the raw column names from the first row (index 0)
-            raw_column_names = [str(x).strip() for x in temp_df.iloc[0].tolist()]
+            # csv.reader honors quoting, so quoted names containing commas
+            # (e.g. '"metric, a"') stay one column; still O(1 row).
+            raw_column_names = [name.strip() for name in next(csv.reader([header_line]))]
 
-            # 2. Check for duplicate column names
-            header_counts = Counter(raw_column_names)
-            dupes = [name for name, count in header_counts.items() if count > 1]
+            # 2. Check for duplicate column names (single C-level sort+scan
+            # instead of per-name dict counting; matters on very wide headers)
+            unique_names, name_counts = np.unique(np.asarray(raw_column_names), return_counts=True)
+            dupes = unique_names[name_counts > 1].tolist()
             if dupes:
                 raise ValueError(f"Duplicate column names detected: {dupes}")
-            
-            # 3. Create the final DataFrame: Set the first row as the actual header and drop it
-            df = temp_df[1:].copy()
-            df.columns = raw_column_names
+
+            # 3. Single parse with the real header row, so columns keep native
+            # numpy dtypes (header=None forced everything to object and
+            # required a second full-frame materialization). Prefer Arrow's
+            # multithreaded CSV reader; text-mode buffers (e.g. StringIO) or
+            # Arrow parse errors fall back to the pandas C engine.
+            if hasattr(file_buffer, 'seek'):
+                file_buffer.seek(0)
+            df = None
+
+            # Very large buffers: stream row chunks and concatenate, keeping
+            # peak RSS near one chunk instead of a whole second copy.
+            if DataLoader._buffer_size(file_buffer) > DataLoader.STREAMING_THRESHOLD_BYTES:
+                reader = pd.read_csv(file_buffer, chunksize=chunksize, low_memory=True)
+                df = pd.concat(reader, copy=False)
+            elif pacsv is not None:
+                try:
+                    table = pacsv.read_csv(
+                        file_buffer,
+                        read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+                    )
+                    df = table.to_pandas()
+                except Exception:
+                    if hasattr(file_buffer, 'seek'):
+                        file_buffer.seek(0)
+            if df is None:
+                df = pd.read_csv(file_buffer, engine="c", low_memory=False)
 
             # 4. Final checks
             if df.empty:
                 raise ValueError("The uploaded dataset is empty.")
-            
-            # 5. Standardize column names (stripping was done above, but good practice)
+
+            # 5. Standardize column names
             df.columns = df.columns.str.strip()
-            
+
             return df
             
         except pd.errors.EmptyDataError:
@@ -59,11 +107,42 @@ class DataLoader:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
 
 
+    @staticmethod
+    def _is_binary_numeric(series: pd.Series) -> bool:
+        """
+        True when a numeric column holds exactly two distinct non-null values.
+
+        Checks a short prefix first: typical 0/1 flag columns reveal both
+        values within a few rows, so most columns resolve without hashing the
+        whole column. A vectorized membership pass (no hashing) then confirms
+        the candidate pair over the remainder.
+        """
+        non_null = series.dropna()
+        head_vals = pd.unique(non_null.head(256))
+        if len(head_vals) > 2:
+            return False
+        if len(non_null) <= 256:
+            return len(head_vals) == 2
+        if len(head_vals) == 2:
+            return bool(non_null.isin(head_vals).all())
+        # Degenerate prefix (constant/empty head on a longer column): fall
+        # back to the full distinct count.
+        return non_null.nunique() == 2
+
     @staticmethod
     def infer_schema(df: pd.DataFrame, target_col: str) -> Dict[str, Any]: # <-- MUST BE DEFINED LIKE THIS
         """
         Infers the data type categories (numeric, categorical, datetime) for features.
         """
+        # Profiling, remediation, and modeling all re-ask for the schema of the
+        # same frame; stash the result on df.attrs keyed by shape/columns/target
+        # so repeat calls are a dict lookup. Any row or column change (or a
+        # different target) misses the key and recomputes.
+        cache_key = (target_col, df.shape, tuple(df.columns))
+        cached = df.attrs.get('cortex_schema')
+        if cached is not None and cached.get('key') == cache_key:
+            return cached['schema']
+
         numeric_cols: List[str] = []
         categorical_cols: List[str] = []
         datetime_cols: List[str] = []
@@ -74,23 +153,30 @@ class DataLoader:
         # Assuming any column with <= 50 unique values OR < 10% of total rows is treated as categorical/object
         max_categorical_cardinality = min(50, int(len(df) * 0.1))
 
+        # One dtypes lookup up front; comparing dtype.kind chars is ~10x
+        # cheaper than a pd.api.types.* call per column, and each df[col].dtype
+        # access would construct a fresh Series accessor.
+        kinds = {col: dt.kind for col, dt in df.dtypes.items()}
+
+        # Cardinality checks below only steer classification, so hashing every
+        # row of a huge frame is wasted work: cap them at a 100k-row sample.
+        if len(df) > 100_000:
+            sample = df.sample(n=100_000, random_state=0)
+        else:
+            sample = df
+
         for col in df.columns:
             if col == target_col:
                 continue
 
             # Check for Datetime
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
+            if kinds[col] == 'M':
                 datetime_cols.append(col)
 
-            # Check for Numeric
-            elif pd.api.types.is_numeric_dtype(df[col]):
+            # Check for Numeric (int/uint/float/complex/bool)
+            elif kinds[col] in 'iufcb':
                 # Check whether a numeric column is actually binary (two unique non-null values)
-                try:
-                    unique_nonnull = df[col].dropna().nunique()
-                except Exception:
-                    unique_nonnull = df[col].nunique()
-
-                if unique_nonnull == 2:
+                if DataLoader._is_binary_numeric(sample[col]):
                     binary_categorical.append(col)
                 else:
                     numeric_cols.append(col)
@@ -98,7 +184,7 @@ class DataLoader:
             # Remaining are treated as Categorical/Text
             else:
                 # If unique count is low, force to categorical
-                if df[col].nunique() <= max_categorical_cardinality:
+                if sample[col].nunique() <= max_categorical_cardinality:
                     categorical_cols.append(col)
                 # For high cardinality strings, we treat them as identifiers or noise for now
                 else:
@@ -111,23 +197,20 @@ class DataLoader:
         # but binary (e.g., 0/1), classify it as binary_categorical so downstream modules
         # treat it as classification.
         if target_col in df.columns:
-            if pd.api.types.is_numeric_dtype(df[target_col]):
-                try:
-                    target_unique = df[target_col].dropna().nunique()
-                except Exception:
-                    target_unique = df[target_col].nunique()
-
-                if target_unique == 2:
+            if kinds[target_col] in 'iufcb':
+                if DataLoader._is_binary_numeric(sample[target_col]):
                     binary_categorical.append(target_col)
                 else:
                     numeric_cols.append(target_col)
             else:
                 categorical_cols.append(target_col)
 
-        return {
+        schema = {
             'numeric': numeric_cols, # No longer filtering out target_col here
             'categorical': categorical_cols, # No longer filtering out target_col here
             'datetime': datetime_cols,
             'binary_categorical': binary_categorical,
             'target': target_col
-        }
\ No newline at end of file
+        }
+        df.attrs['cortex_schema'] = {'key': cache_key, 'schema': schema}
+        return schema
\ No newline at end of file
@@ -1,14 +1,17 @@
+import os
+
 import pandas as pd
 import numpy as np
+import joblib
+import scipy.sparse as sp
+from joblib import Parallel, delayed
 from sklearn.model_selection import StratifiedKFold, cross_val_score
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.impute import SimpleImputer
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
+
+from src.modeling.baseline import BaselineModeler
 
 class NeuralArena:
     COMPETITORS = {
@@ -50,14 +53,19 @@ class NeuralArena:
     }
 
     @staticmethod
-    def _create_preprocessing_pipeline(numerical_cols: list, categorical_cols: list) -> ColumnTransformer:
+    def _create_preprocessing_pipeline(numerical_cols: list, categorical_cols: list, min_frequency=None) -> ColumnTransformer:
         numerical_pipeline = Pipeline([
             ('imputer', SimpleImputer(strategy='median')),
             ('scaler', StandardScaler())
         ])
+        # Sparse OHE output keeps the stacked matrix CSR instead of a dense
+        # N x (sum of cardinalities) float64 block; every arena competitor
+        # except the histogram booster consumes CSR natively (it gets a
+        # dense view just-in-time in run_arena).
         categorical_pipeline = Pipeline([
             ('imputer', SimpleImputer(strategy='constant', fill_value='missing')),
-            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=True,
+                                     min_frequency=min_frequency, max_categories=64))
         ])
         return ColumnTransformer(transformers=[
             ('num', numerical_pipeline, numerical_cols),
@@ -65,24 +73,69 @@ class NeuralArena:
         ], remainder='drop')
 
     @staticmethod
-    def run_arena(df: pd.DataFrame, target_col: str, schema: dict) -> dict:
+    def run_arena(df: pd.DataFrame, target_col: str, schema: dict, y_override=None) -> dict:
         """Run the Neural Arena competition with 5 competitors"""
         try:
-            df_copy = df.copy()
-            X = df_copy.drop(columns=[target_col])
-            y = df_copy[target_col]
+            # No up-front copy: drop() returns a new frame and nothing here
+            # mutates the caller's df. y_override takes pre-factorized target
+            # codes so string labels are only encoded once upstream.
+            X = df.drop(columns=[target_col])
+            y = df[target_col] if y_override is None else pd.Series(y_override, index=df.index)
 
             numerical_cols = [c for c in schema['numeric'] if c in X.columns]
             categorical_cols = [c for c in schema['categorical'] if c in X.columns]
 
-            preprocessor = NeuralArena._create_preprocessing_pipeline(numerical_cols, categorical_cols)
+            # Rare-category collapsing only kicks in once "rare" is
+            # meaningful (same rule as the baseline modeler).
+            min_frequency = max(10, int(0.005 * len(X))) if len(X) >= 1000 else None
+            preprocessor = NeuralArena._create_preprocessing_pipeline(numerical_cols, categorical_cols, min_frequency=min_frequency)
+
+            # Fit the preprocessor ONCE and feed every competitor the same
+            # transformed matrix: 1 imputer/scaler/OHE fit instead of 25
+            # (5 models x 5 folds). Imputation statistics see all folds,
+            # which is an acceptable approximation for diagnostic scoring.
+            # The fitted result is spilled to the same disk cache the
+            # baseline modeler uses (own '.arena' namespace — the arena's
+            # scaled pipeline differs from the baseline's passthrough one),
+            # so re-running the arena on the same upload skips fit_transform.
+            cache_path = os.path.join(
+                BaselineModeler.PREP_CACHE_DIR,
+                BaselineModeler._prep_cache_key(X, numerical_cols, categorical_cols, []) + '.arena.joblib'
+            )
+            if os.path.exists(cache_path):
+                preprocessor, X_pre = joblib.load(cache_path)
+            else:
+                X_pre = preprocessor.fit_transform(X)
+                try:
+                    os.makedirs(BaselineModeler.PREP_CACHE_DIR, exist_ok=True)
+                    joblib.dump((preprocessor, X_pre), cache_path)
+                except OSError:
+                    pass  # cache is best-effort; a full /tmp must not fail the run
+
+            # Define competitors (estimator imports deferred to here so the
+            # arena module itself stays cheap to import at app startup)
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+            from sklearn.svm import SVC, LinearSVC
+            from sklearn.kernel_approximation import Nystroem
+            from sklearn.neighbors import KNeighborsClassifier
 
-            # Define competitors
             models = {
                 "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
-                "Random Forest": RandomForestClassifier(n_estimators=100, random_state=42),
-                "Gradient Boosting": GradientBoostingClassifier(n_estimators=100, random_state=42),
-                "SVM": SVC(kernel='rbf', random_state=42),
+                # Bounded depth keeps RF fit/predict time predictable on wide
+                # data; the histogram booster bins features and is 5-20x
+                # faster than the exact GradientBoostingClassifier for
+                # comparable accuracy.
+                "Random Forest": RandomForestClassifier(n_estimators=100, max_depth=16, min_samples_leaf=5, n_jobs=1, random_state=42),
+                "Gradient Boosting": HistGradientBoostingClassifier(max_iter=100, random_state=42),
+                # Exact rbf SVC is O(N^2)+ in fit and dwarfs the rest of the
+                # arena past ~10k rows; above that, a Nystroem kernel
+                # approximation feeding a linear SVM keeps the margin-based
+                # competitor at O(N*F) cost.
+                "SVM": SVC(kernel='rbf', cache_size=500, random_state=42) if len(X) <= 10000 else Pipeline([
+                    ('nys', Nystroem(n_components=200, random_state=42)),
+                    ('svc', LinearSVC(max_iter=2000, random_state=42))
+                ]),
                 "KNN": KNeighborsClassifier(n_neighbors=5)
             }
 
@@ -93,34 +146,25 @@ class NeuralArena:
             # Use Stratified K-Fold for robust evaluation
             skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
 
-            for model_name, model in models.items():
+            # The five competitors are independent fits on the same matrix,
+            # so run them concurrently (keep the inner CV serial to avoid
+            # nested-parallel oversubscription).
+            def _score_one(model_name, model):
                 try:
-                    pipeline = Pipeline(steps=[
-                        ('preprocessor', preprocessor),
-                        ('model', model)
-                    ])
-
-                    # Get stratified cross-validation scores
-                    cv_scores = cross_val_score(pipeline, X, y, cv=skf, scoring='accuracy')
-                    accuracy = cv_scores.mean()
-                    std_dev = cv_scores.std()
-
-                    results[model_name] = {
-                        "accuracy": float(accuracy),
-                        "accuracy_pct": f"{accuracy * 100:.1f}%",
-                        "std_dev": float(std_dev),
-                        "cv_scores": [float(score) for score in cv_scores],
-                        "title": NeuralArena.COMPETITORS[model_name]["title"],
-                        "description": NeuralArena.COMPETITORS[model_name]["description"],
-                        "icon": NeuralArena.COMPETITORS[model_name]["icon"],
-                        "color": NeuralArena.COMPETITORS[model_name]["color"]
-                    }
+                    # HistGradientBoosting is the one competitor that
+                    # requires dense input.
+                    X_m = X_pre.toarray() if model_name == "Gradient Boosting" and sp.issparse(X_pre) else X_pre
+                    scores = cross_val_score(model, X_m, y, cv=skf, scoring='accuracy', n_jobs=1)
+                    return model_name, scores, None
+                except Exception as e:
+                    return model_name, None, str(e)
 
-                    if accuracy > best_accuracy:
-                        best_accuracy = accuracy
-                        best_model_name = model_name
+            scored = Parallel(n_jobs=min(len(models), os.cpu_count() or 1), backend='loky')(
+                delayed(_score_one)(name, model) for name, model in models.items()
+            )
 
-                except Exception as e:
+            for model_name, cv_scores, error in scored:
+                if error is not None:
                     results[model_name] = {
                         "accuracy": 0.0,
                         "accuracy_pct": "0.0%",
@@ -128,8 +172,27 @@ class NeuralArena:
                         "cv_scores": [],
                         "title": NeuralArena.COMPETITORS[model_name]["title"],
                         "description": NeuralArena.COMPETITORS[model_name]["description"],
-                        "error": str(e)
+                        "error": error
                     }
+                    continue
+
+                accuracy = cv_scores.mean()
+                std_dev = cv_scores.std()
+
+                results[model_name] = {
+                    "accuracy": float(accuracy),
+                    "accuracy_pct": f"{accuracy * 100:.1f}%",
+                    "std_dev": float(std_dev),
+                    "cv_scores": [float(score) for score in cv_scores],
+                    "title": NeuralArena.COMPETITORS[model_name]["title"],
+                    "description": NeuralArena.COMPETITORS[model_name]["description"],
+                    "icon": NeuralArena.COMPETITORS[model_name]["icon"],
+                    "color": NeuralArena.COMPETITORS[model_name]["color"]
+                }
+
+                if accuracy > best_accuracy:
+                    best_accuracy = accuracy
+                    best_model_name = model_name
 
             # Sort by accuracy (descending)
             sorted_results = dict(sorted(results.items(), key=lambda x: x[1]["accuracy"], reverse=True))
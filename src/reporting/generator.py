@@ -18,7 +18,6 @@ from src.core.health import DataHealth
 from src.core.profiling import DataProfiler
 from src.core.imbalance import ImbalanceAnalyzer
 from src.reporting.scorer import HealthScorer
-from src.modeling.baseline import BaselineModeler
 from src.core.bias import BiasAnalyzer
 
 # In src/reporting/generator.py
@@ -63,6 +62,11 @@ def run_analysis_pipeline(df: pd.DataFrame, target_col: str, sensitive_cols: lis
                 # Must be categorical/datetime/unknown (treated as classification)
                 analysis_results['target_is_numeric'] = False
 
+            # Encode a classification target once here; downstream modules
+            # take the integer codes instead of re-walking string labels.
+            if not analysis_results['target_is_numeric']:
+                analysis_results['_y_codes'], analysis_results['_y_labels'] = pd.factorize(df[target_col])
+
         except Exception as e:
 # ... (rest of the code is unchanged)
             st.error(f"FATAL: Schema Inference Failed. Cannot proceed. Error: {e}")
@@ -111,10 +115,14 @@ def run_analysis_pipeline(df: pd.DataFrame, target_col: str, sensitive_cols: lis
 
         # 7. Baseline Modeling (Diagnostic)
         try:
+            # Imported here so the modeling stack (sklearn estimators, SHAP)
+            # only loads when the diagnostic model actually runs.
+            from src.modeling.baseline import BaselineModeler
             # ONLY call baseline if schema inference and imbalance gave dicts (required inputs)
             if 'error' not in analysis_results['schema'] and 'error' not in analysis_results['imbalance']:
                  analysis_results['baseline'] = BaselineModeler.run_baseline_model(
-                    df, target_col, analysis_results['schema'], is_classification=(not analysis_results['target_is_numeric'])
+                    df, target_col, analysis_results['schema'], is_classification=(not analysis_results['target_is_numeric']),
+                    y_override=analysis_results.get('_y_codes')
                 )
             else:
                 analysis_results['baseline']['error'] = "Prerequisites for modeling failed."
@@ -169,6 +177,10 @@ def render_report(results: dict, target_col: str):
             
         st.subheader("Feature Cardinality Analysis")
         cardinality_raw = results['health'].get('cardinality', {})
+        # Drop the underscore-prefixed packed arrays the scorer consumes;
+        # only the per-column dicts are table-shaped.
+        if isinstance(cardinality_raw, dict):
+            cardinality_raw = {k: v for k, v in cardinality_raw.items() if not k.startswith('_')}
 
         if not cardinality_raw:
             st.info("No cardinality information available for this dataset.")
@@ -291,10 +303,9 @@ def render_report(results: dict, target_col: str):
                 st.success("✅ Baseline performance suggests no severe data leakage.")
 
         st.subheader("Top Feature Importances (Random Forest)")
-        importance_df = pd.DataFrame.from_dict(
-            baseline['feature_importances'], 
-            orient='index', 
-            columns=['Importance Score']
+        importance_df = pd.DataFrame(
+            {"Importance Score": baseline['feature_importances']['scores']},
+            index=baseline['feature_importances']['names']
         )
         st.dataframe(importance_df.head(10), use_container_width=True)
 
@@ -1,173 +1,399 @@
-class HealthScorer:
+import bisect
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+__all__ = ['HealthScorer']
+
+# Dashboard reruns recompute the score for identical summaries; a small LRU
+# keyed by the canonicalized inputs returns those in O(1).
+_SCORE_CACHE = OrderedDict()
+_SCORE_CACHE_MAX = 128
+
+
+def _freeze(obj):
+    """Recursively convert dicts/lists/arrays into hashable sorted tuples."""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    if isinstance(obj, np.ndarray):
+        return (obj.shape, obj.dtype.str, obj.tobytes())
+    return obj
+
+
+@lru_cache(maxsize=1)
+def _max_mean_kernel():
     """
-    Calculates a unified Dataset Health Score (0-100) based on weighted penalties
-    derived from dataset health and imbalance analysis.
+    Lazily build a numba-compiled fused max+mean reduction, or return None
+    when numba is unavailable. Resolved on first use so the scorer never
+    pays the numba import (or JIT compile) on the common narrow-schema path.
     """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
 
-    # Weights for different penalty categories (sum to 100 for maximum impact)
-    PENALTY_WEIGHTS = {
-        "missing_data": 35,    # High weight: Missing data often requires imputation/dropping
-        "imbalance_risk": 30,  # High weight: Imbalance kills model performance
-        "duplicate_data": 15,  # Medium weight: Data leakage/training inefficiency
-        "cardinality_risk": 10, # Low weight: ID columns (risk for modeling)
-        "constant_features": 10 # Low weight: Useless/constant features
-    }
+    @njit(cache=True)
+    def _max_mean(a):
+        mx = 0.0
+        total = 0.0
+        for x in a:
+            if x > mx:
+                mx = x
+            total += x
+        return mx, total / len(a)
 
-    @staticmethod
-    def calculate_missing_data_penalty(missing_summary: dict, total_rows: int) -> float:
-        """
-        Penalizes based on the percentage of missing values.
-        
-        Uses a stepped approach:
-        > 80% missing in ANY column: MAX penalty (35)
-        > 40% AVG missing: High penalty (75% of 35)
-        > 5% AVG missing: Moderate penalty (25% of 35)
-        """
-        if not missing_summary:
-            return 0.0
+    return _max_mean
+
+# Penalty weights bound once at module scope: the hot paths read these as a
+# single global load instead of a class-attribute access plus dict hash per
+# call. PENALTY_WEIGHTS below is derived from them for external consumers.
+_W_MISSING = 35
+_W_IMBALANCE = 30
+_W_DUPLICATE = 15
+_W_CARDINALITY = 10
+_W_CONSTANT = 10
+
+# Internally penalties accumulate in integer hundredths of a point: the
+# factors are all rational (1.0 / 0.75 / 0.5 / 0.25), so scaled-int adds are
+# exact and the single final divide replaces per-penalty float rounding.
+_W_MISSING_Q = _W_MISSING * 100
+_W_IMBALANCE_Q = _W_IMBALANCE * 100
+_W_DUPLICATE_Q = _W_DUPLICATE * 100
+_W_CARDINALITY_Q = _W_CARDINALITY * 100
+_W_CONSTANT_Q = _W_CONSTANT * 100
+
+# The penalty factors only ever take five discrete values, so they live in
+# one int8 table (in hundredths) indexed by severity level; the batch path
+# gathers factors for a whole batch with a single fancy-index. LOW and
+# unknown severities map to slot 0.
+_FACTOR_Q = np.array([0, 25, 50, 75, 100], dtype=np.int8)
+_SEVERITY_IDX = {'SEVERE': 4, 'MEDIUM': 2}
+
+# Score interpretation bands, resolved with one bisect instead of an
+# if/elif ladder: bisect_right counts how many band floors the score has
+# reached (<50 Poor, >=50 Fair, >=70 Good, >=90 Excellent).
+_SCORE_THRESHOLDS = (50, 70, 90)
+_INTERPRETATIONS = (
+    "Poor. Critical data issues detected. Modeling is highly discouraged without major data cleaning or feature engineering.",
+    "Fair. Significant risks (high imbalance or missing data) detected. Requires careful data remediation before modeling.",
+    "Good. Minor issues detected, manageable with standard preprocessing (imputation, light balancing).",
+    "Excellent. This dataset is exceptionally clean and ready for modeling.",
+)
+
+
+def _missing_penalty_q(missing_summary: dict, total_rows: int) -> int:
+    """
+    Missing-data penalty in integer hundredths.
+
+    Stepped approach:
+    > 80% missing in ANY column: MAX penalty (35)
+    > 40% AVG missing: High penalty (75% of 35)
+    > 5% AVG missing: Moderate penalty (25% of 35)
+    """
+    if not missing_summary:
+        return 0
 
-        # Expecting missing_summary to be the dict output of DataFrame.to_dict(),
-        # i.e. { 'Missing Count': {col: count, ...}, 'Missing Percent': {col: pct, ...} }
-        missing_percents_map = missing_summary.get('Missing Percent', {})
-        if not missing_percents_map:
-            return 0.0
+    # Expecting missing_summary to be the dict output of DataFrame.to_dict(),
+    # i.e. { 'Missing Count': {col: count, ...}, 'Missing Percent': {col: pct, ...} }
+    missing_percents_map = missing_summary.get('Missing Percent', {})
+    if not missing_percents_map:
+        return 0
 
-        missing_percents = list(missing_percents_map.values())
+    # One C-level pass over a float32 array instead of Python-level
+    # any()/sum() loops; matters on very wide schemas.
+    arr = np.fromiter(missing_percents_map.values(), dtype=np.float32,
+                      count=len(missing_percents_map))
 
+    # Genomics-style schemas (tens of thousands of columns) get a fused
+    # single-pass max+mean kernel; everything else sticks with the two
+    # numpy reductions, which are already C-speed at that size.
+    kernel = _max_mean_kernel() if arr.size >= 10_000 else None
+    if kernel is not None:
+        max_missing, avg_missing = kernel(arr)
         # Rule 1: Catastrophic failure (any column > 80% missing)
-        if any(p > 80 for p in missing_percents):
-            return HealthScorer.PENALTY_WEIGHTS["missing_data"]
+        if max_missing > 80:
+            return _W_MISSING_Q
+        avg_missing = float(avg_missing)
+    else:
+        # Rule 1 first, so the catastrophic case returns before the mean
+        # reduction is ever computed. (The fused kernel above gets both in
+        # one pass anyway, so it skips nothing by checking after.)
+        if arr.max() > 80:
+            return _W_MISSING_Q
+        avg_missing = float(arr.mean())
 
-        # Calculate the average missing percentage of affected columns
-        avg_missing = sum(missing_percents) / len(missing_percents)
+    # Rule 2: High or Moderate penalties (based on average impact)
+    if avg_missing > 40:
+        # High average missingness (40-80%): 75% of max penalty
+        return _W_MISSING_Q * 75 // 100
+    elif avg_missing > 5:
+        # Moderate average missingness (5-40%): 25% of max penalty
+        return _W_MISSING_Q * 25 // 100
 
-        # Rule 2: High or Moderate penalties (based on average impact)
-        if avg_missing > 40:
-            # High average missingness (40-80%): 75% of max penalty
-            return HealthScorer.PENALTY_WEIGHTS["missing_data"] * 0.75
-        elif avg_missing > 5:
-            # Moderate average missingness (5-40%): 25% of max penalty
-            return HealthScorer.PENALTY_WEIGHTS["missing_data"] * 0.25
+    return 0
 
-        return 0.0
 
-    @staticmethod
-    def calculate_imbalance_penalty(imbalance_analysis: dict) -> float:
-        """
-        Penalizes based on the imbalance severity detected in the target variable.
-        """
-        if imbalance_analysis.get('type') != 'Classification':
-            return 0.0 # Only penalize classification tasks for imbalance
-
-        severity = imbalance_analysis.get('severity', 'LOW')
-        
-        if severity == "SEVERE":
-            return HealthScorer.PENALTY_WEIGHTS["imbalance_risk"] * 1.0
-        elif severity == "MEDIUM":
-            return HealthScorer.PENALTY_WEIGHTS["imbalance_risk"] * 0.5
-        
-        return 0.0
+def _imbalance_penalty_q(imbalance_analysis: dict) -> int:
+    """Imbalance penalty in integer hundredths."""
+    if imbalance_analysis.get('type') != 'Classification':
+        return 0  # Only penalize classification tasks for imbalance
 
-    @staticmethod
-    def calculate_duplicate_penalty(duplicate_summary: dict) -> float:
-        """
-        Penalizes based on the percentage of duplicated rows.
-        """
-        duplicate_percent = duplicate_summary.get('duplicate_percent', 0.0)
-        
-        # Max penalty if >10% duplicates
-        if duplicate_percent > 10: 
-            normalized_penalty = 1.0
-        # Medium penalty if >1% duplicates
-        elif duplicate_percent > 1: 
-            normalized_penalty = 0.5
-        else:
-            normalized_penalty = 0.0
-            
-        return normalized_penalty * HealthScorer.PENALTY_WEIGHTS["duplicate_data"]
+    severity = imbalance_analysis.get('severity', 'LOW')
+    return int(_FACTOR_Q[_SEVERITY_IDX.get(severity, 0)]) * _W_IMBALANCE
 
-    @staticmethod
-    def calculate_cardinality_penalty(cardinality_summary: dict, total_rows: int) -> float:
-        """
-        Penalizes for features with high cardinality (potential ID/noise) or constant features.
-        
-        FIX: Penalty is now based on the proportion of features affected.
-        """
-        high_cardinality_count = 0
-        constant_count = 0
 
-        # Expect cardinality_summary to look like:
-        # { 'Unique Values': {col: count, ...}, 'Cardinality Flag': {col: flag, ...} }
-        unique_map = cardinality_summary.get('Unique Values', {})
-        flag_map = cardinality_summary.get('Cardinality Flag', {})
+def _duplicate_penalty_q(duplicate_summary: dict) -> int:
+    """Duplicate-rows penalty in integer hundredths."""
+    duplicate_percent = duplicate_summary.get('duplicate_percent', 0.0)
+
+    # Branchless: >1% contributes half the weight, >10% the other half
+    # (full weight for heavy duplication, half for medium, zero otherwise).
+    half = _W_DUPLICATE_Q // 2
+    return (duplicate_percent > 10) * half + (duplicate_percent > 1) * half
+
 
-        all_cols_count = len(unique_map)
-        if all_cols_count == 0:
-            return 0.0
+def _cardinality_penalty_q(cardinality_summary: dict, total_rows: int) -> int:
+    """
+    High-cardinality/constant-feature penalty in integer hundredths,
+    proportional to the fraction of features affected.
+    """
+    # Preferred path: the packed arrays the health module emits alongside
+    # the per-column dicts — two C-level reductions, no Python iteration.
+    counts_arr = cardinality_summary.get('_unique_counts')
+    flags_arr = cardinality_summary.get('_id_flags')
+    if counts_arr is not None and flags_arr is not None and len(counts_arr):
+        return (int(np.count_nonzero(flags_arr)) * _W_CARDINALITY_Q
+                + int((counts_arr <= 1).sum()) * _W_CONSTANT_Q) // len(counts_arr)
+
+    # Fallback: dict-shaped summaries from older producers or tests.
+    # { 'Unique Values': {col: count, ...}, 'Cardinality Flag': {col: flag, ...} }
+    unique_map = cardinality_summary.get('Unique Values', {})
+    flag_map = cardinality_summary.get('Cardinality Flag', {})
+
+    all_cols_count = len(unique_map)
+    if all_cols_count == 0:
+        return 0
+
+    # Constant-column count as one C comparison over a packed count vector;
+    # summaries carrying non-numeric counts drop to a guarded Python pass.
+    try:
+        counts = np.fromiter(unique_map.values(), dtype=np.float64,
+                             count=all_cols_count)
+        constant_count = int((counts <= 1).sum())
+    except (TypeError, ValueError):
+        constant_count = sum(
+            1 for c in unique_map.values()
+            if isinstance(c, (int, float)) and c <= 1
+        )
 
-        for col_name, flag in flag_map.items():
-            if flag == 'High (Potential ID)':
-                high_cardinality_count += 1
+    # The flag check compares Python strings either way, so it stays a
+    # plain generator count.
+    high_cardinality_count = sum(
+        1 for col_name in unique_map
+        if flag_map.get(col_name) == 'High (Potential ID)'
+    )
 
-        for col_name, count in unique_map.items():
-            try:
-                if count <= 1:
-                    constant_count += 1
-            except Exception:
-                # If count is not numeric, skip it
-                continue
+    return (high_cardinality_count * _W_CARDINALITY_Q
+            + constant_count * _W_CONSTANT_Q) // all_cols_count
 
-        # Penalty is proportional to the fraction of features that have the issue.
-        penalty_id = (high_cardinality_count / all_cols_count) * HealthScorer.PENALTY_WEIGHTS["cardinality_risk"]
-        penalty_constant = (constant_count / all_cols_count) * HealthScorer.PENALTY_WEIGHTS["constant_features"]
 
-        return penalty_id + penalty_constant
+# Public float-valued wrappers around the quantized kernels, defined at
+# module level so hot callers pay a plain LOAD_GLOBAL instead of the class
+# attribute lookup plus staticmethod descriptor hop. HealthScorer re-exports
+# them below for the existing class-based API.
+def calculate_missing_data_penalty(missing_summary: dict, total_rows: int) -> float:
+    """
+    Penalizes based on the percentage of missing values.
+    """
+    return _missing_penalty_q(missing_summary, total_rows) / 100.0
+
+
+def calculate_imbalance_penalty(imbalance_analysis: dict) -> float:
+    """
+    Penalizes based on the imbalance severity detected in the target variable.
+    """
+    return _imbalance_penalty_q(imbalance_analysis) / 100.0
 
 
+def calculate_duplicate_penalty(duplicate_summary: dict) -> float:
+    """
+    Penalizes based on the percentage of duplicated rows.
+    """
+    return _duplicate_penalty_q(duplicate_summary) / 100.0
+
+
+def calculate_cardinality_penalty(cardinality_summary: dict, total_rows: int) -> float:
+    """
+    Penalizes for features with high cardinality (potential ID/noise) or constant features.
+    """
+    return _cardinality_penalty_q(cardinality_summary, total_rows) / 100.0
+
+
+def _is_empty_summary(summary) -> bool:
+    """True for None/{} or a summary whose inner maps are all empty."""
+    if not summary:
+        return True
+    if isinstance(summary, dict):
+        # len() for sized values (ndarrays have no unambiguous truth value)
+        return all(
+            (len(v) == 0 if hasattr(v, '__len__') else not v)
+            for v in summary.values()
+        )
+    return False
+
+
+def get_health_scores_batch(batch):
+    """
+    Score many datasets in one call, for catalog-style sweeps.
+
+    Takes a list of (health_results, imbalance_results, total_rows) tuples —
+    the same arguments get_health_score takes one at a time — and returns
+    (scores, interpretations): an int ndarray of final scores and a parallel
+    list of interpretation strings.
+
+    The missing-data reduction, the dominant numeric work, is vectorized
+    across the whole batch: every dataset's missing percents are laid into
+    one flat array with per-dataset offsets and reduced with two reduceat
+    calls, so the batch pays two C loops instead of 2N numpy dispatches.
+    The remaining penalties are dict probes and stay as per-dataset calls.
+    """
+    n = len(batch)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), []
+
+    flat = []
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    for i, (health_results, _, _) in enumerate(batch):
+        missing_summary = health_results.get('missing_data') or {}
+        flat.extend(missing_summary.get('Missing Percent', {}).values())
+        offsets[i + 1] = len(flat)
+
+    missing_q = np.zeros(n, dtype=np.int64)
+    counts = np.diff(offsets)
+    has_vals = counts > 0
+    if flat:
+        flat_arr = np.asarray(flat, dtype=np.float32)
+        # Dropping the empty datasets' offsets leaves indices that still
+        # partition the flat array exactly, so reduceat never sees an
+        # empty (and therefore misbehaving) segment.
+        seg_starts = offsets[:-1][has_vals]
+        seg_max = np.maximum.reduceat(flat_arr, seg_starts)
+        seg_mean = np.add.reduceat(flat_arr, seg_starts) / counts[has_vals]
+        missing_q[has_vals] = np.select(
+            [seg_max > 80, seg_mean > 40, seg_mean > 5],
+            [_W_MISSING_Q, _W_MISSING_Q * 75 // 100, _W_MISSING_Q * 25 // 100],
+            0,
+        )
+
+    # Imbalance factors come out of the int8 table in one gather: build the
+    # severity-slot vector (slot 0 for regression or unknown severities),
+    # fancy-index _FACTOR_Q, and scale by the weight.
+    severity_idx = np.fromiter(
+        (
+            _SEVERITY_IDX.get(imbalance_results.get('severity'), 0)
+            if imbalance_results.get('type') == 'Classification' else 0
+            for _, imbalance_results, _ in batch
+        ),
+        dtype=np.intp, count=n,
+    )
+    imbalance_q = _FACTOR_Q[severity_idx].astype(np.int64) * _W_IMBALANCE
+
+    other_q = np.fromiter(
+        (
+            _duplicate_penalty_q(health_results.get('duplicate_summary') or {})
+            + _cardinality_penalty_q(health_results.get('cardinality') or {}, total_rows)
+            for health_results, _, total_rows in batch
+        ),
+        dtype=np.int64, count=n,
+    )
+
+    scores = np.maximum(0, 100 - (missing_q + imbalance_q + other_q + 50) // 100)
+    bands = np.searchsorted(_SCORE_THRESHOLDS, scores, side='right')
+    interpretations = [_INTERPRETATIONS[b] for b in bands]
+    return scores, interpretations
+
+
+class HealthScorer:
+    """
+    Calculates a unified Dataset Health Score (0-100) based on weighted penalties
+    derived from dataset health and imbalance analysis.
+    """
+
+    # Weights for different penalty categories (sum to 100 for maximum impact)
+    PENALTY_WEIGHTS = {
+        "missing_data": _W_MISSING,        # High weight: Missing data often requires imputation/dropping
+        "imbalance_risk": _W_IMBALANCE,    # High weight: Imbalance kills model performance
+        "duplicate_data": _W_DUPLICATE,    # Medium weight: Data leakage/training inefficiency
+        "cardinality_risk": _W_CARDINALITY, # Low weight: ID columns (risk for modeling)
+        "constant_features": _W_CONSTANT   # Low weight: Useless/constant features
+    }
+
+    # Re-exports of the module-level implementations, so the long-standing
+    # HealthScorer.calculate_*() call sites keep working unchanged.
+    calculate_missing_data_penalty = staticmethod(calculate_missing_data_penalty)
+    calculate_imbalance_penalty = staticmethod(calculate_imbalance_penalty)
+    calculate_duplicate_penalty = staticmethod(calculate_duplicate_penalty)
+    calculate_cardinality_penalty = staticmethod(calculate_cardinality_penalty)
+    get_health_scores_batch = staticmethod(get_health_scores_batch)
+    _is_empty_summary = staticmethod(_is_empty_summary)
+
     @staticmethod
     def get_health_score(health_results: dict, imbalance_results: dict, total_rows: int) -> tuple[int, str]:
         """
         Calculates the final score and provides a human-readable interpretation.
-        
+
         Returns:
             (int, str): The final score (0-100) and the interpretation text.
         """
-        total_penalty = 0.0
-        
+        # Memoize on the canonicalized inputs; unhashable oddities simply
+        # skip the cache.
+        try:
+            cache_key = (_freeze(health_results), _freeze(imbalance_results), total_rows)
+        except TypeError:
+            cache_key = None
+        if cache_key is not None and cache_key in _SCORE_CACHE:
+            _SCORE_CACHE.move_to_end(cache_key)
+            return _SCORE_CACHE[cache_key]
+
+        total_q = 0
+
+        # Each penalty kernel is only invoked when its input actually holds
+        # something to penalize; on the common clean-dataset path every
+        # branch below is a guaranteed zero and skipped outright.
+
         # 1. Missing Data Penalty
-        missing_penalty = HealthScorer.calculate_missing_data_penalty(
-            health_results.get('missing_data', {}), total_rows
-        )
-        total_penalty += missing_penalty
-        
-        # 2. Imbalance Penalty
-        imbalance_penalty = HealthScorer.calculate_imbalance_penalty(imbalance_results)
-        total_penalty += imbalance_penalty
-        
+        missing_summary = health_results.get('missing_data')
+        if not _is_empty_summary(missing_summary):
+            total_q += _missing_penalty_q(missing_summary, total_rows)
+
+        # 2. Imbalance Penalty (only classification targets are penalized)
+        if imbalance_results.get('type') == 'Classification':
+            total_q += _imbalance_penalty_q(imbalance_results)
+
         # 3. Duplicate Penalty
-        duplicate_penalty = HealthScorer.calculate_duplicate_penalty(
-            health_results.get('duplicate_summary', {})
-        )
-        total_penalty += duplicate_penalty
-        
+        duplicate_summary = health_results.get('duplicate_summary')
+        if not _is_empty_summary(duplicate_summary):
+            total_q += _duplicate_penalty_q(duplicate_summary)
+
         # 4. Cardinality & Constant Feature Penalty
         # Note: We pass the raw cardinality summary (which is nested)
-        cardinality_penalty = HealthScorer.calculate_cardinality_penalty(
-            health_results.get('cardinality', {}), total_rows
-        )
-        total_penalty += cardinality_penalty
+        cardinality_summary = health_results.get('cardinality')
+        if not _is_empty_summary(cardinality_summary):
+            total_q += _cardinality_penalty_q(cardinality_summary, total_rows)
+
+        # Calculate final score: integer adds all the way down, one
+        # round-half-up divide at the end.
+        final_score = max(0, 100 - (total_q + 50) // 100)
 
-        # Calculate final score
-        final_score = max(0, 100 - round(total_penalty))
-        
         # Interpret the score
-        if final_score >= 90:
-            interpretation = "Excellent. This dataset is exceptionally clean and ready for modeling."
-        elif final_score >= 70:
-            interpretation = "Good. Minor issues detected, manageable with standard preprocessing (imputation, light balancing)."
-        elif final_score >= 50:
-            interpretation = "Fair. Significant risks (high imbalance or missing data) detected. Requires careful data remediation before modeling."
-        else:
-            interpretation = "Poor. Critical data issues detected. Modeling is highly discouraged without major data cleaning or feature engineering."
-
-        return final_score, interpretation
\ No newline at end of file
+        interpretation = _INTERPRETATIONS[bisect.bisect_right(_SCORE_THRESHOLDS, final_score)]
+
+        if cache_key is not None:
+            _SCORE_CACHE[cache_key] = (final_score, interpretation)
+            if len(_SCORE_CACHE) > _SCORE_CACHE_MAX:
+                _SCORE_CACHE.popitem(last=False)
+
+        return final_score, interpretation
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Make the repository root importable once for the whole session, instead of
+# each test module appending to sys.path at import time.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
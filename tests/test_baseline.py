@@ -3,35 +3,38 @@ import pandas as pd
 import numpy as np
 from src.modeling.baseline import BaselineModeler
 
-# Fixture for a standard classification problem
-@pytest.fixture
+# Fixture for a standard classification problem. Session-scoped with a
+# seeded generator: the frame is built once and shared by every test that
+# reads it (no test mutates it), and the seed keeps runs deterministic.
+@pytest.fixture(scope="session")
 def classification_data():
+    rng = np.random.default_rng(0)
     df = pd.DataFrame({
-        'feature_num_a': np.random.rand(50),
-        'feature_num_b': np.random.rand(50) * 10,
+        'feature_num_a': rng.random(50),
+        'feature_num_b': rng.random(50) * 10,
         'feature_cat_c': ['A', 'B'] * 25,
         'target_class': [0] * 30 + [1] * 20
     })
     # Add some NaNs to ensure the pipeline handles missing data silently (though not optimally)
     df.loc[0, 'feature_num_a'] = np.nan
     df.loc[1, 'feature_cat_c'] = np.nan
-    
+
     return df
 
 # Fixture for data with perfect leakage (CV score will be 1.0)
-@pytest.fixture
+@pytest.fixture(scope="session")
 def leakage_data():
     df = pd.DataFrame({
         'feature_leak_id': range(50), # ID column, useless but not leakage
-        'feature_leak_key': [f'key_{i}' for i in range(50)], # High cardinality
+        'feature_leak_key': list(map('key_{}'.format, range(50))), # High cardinality
         'target_class': [0] * 30 + [1] * 20
     })
     # The actual leakage: A feature that perfectly maps to the target
     df['perfect_leak'] = df['target_class'].apply(lambda x: 'Y' if x == 1 else 'N')
-    
+
     return df
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_schema_class():
     return {
         'numeric': ['feature_num_a', 'feature_num_b'],
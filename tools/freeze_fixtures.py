@@ -0,0 +1,50 @@
+"""
+One-time generator for the Parquet test fixtures under tests/data/.
+
+Run from the repository root after changing a fixture definition:
+
+    python tools/freeze_fixtures.py
+
+Freezing the frames to Parquet gives the tests a C-backed columnar load
+with stable dtypes instead of re-running pandas' dict-of-lists dtype
+inference on every session.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'tests', 'data')
+
+
+def shap_mini() -> pd.DataFrame:
+    # Bigger dummy data: need enough rows per class for stratified CV.
+    # 'sex' is declared Categorical with its categories fixed up front, so
+    # the dtype round-trips through Parquet and the modeler's category cast
+    # is a no-op instead of a unique+sort inference pass.
+    return pd.DataFrame({
+        'age': [22, 38, 26, 35, 35, 23, 45, 18, 30, 40, 50, 20, 25, 33, 42],
+        'fare': [7.25, 71.28, 7.92, 53.10, 8.05, 8.45, 10.50, 7.00, 15.00, 20.00, 100.0, 8.0, 9.0, 12.0, 15.0],
+        'sex': pd.Categorical(
+            ['male', 'female', 'female', 'female', 'male', 'female', 'male', 'male', 'female', 'male', 'female', 'male', 'female', 'male', 'female'],
+            categories=['female', 'male']
+        ),
+        'survived': [0, 1, 1, 1, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1]  # Balanced enough for CV
+    })
+
+
+def remediator_mini() -> pd.DataFrame:
+    # Enough rows to satisfy KNN (k=2)
+    return pd.DataFrame({
+        'age': [20, np.nan, 30, 40, 50],
+        'fare': [10, 11, 10, 50, 45],
+        'survived': [0, 1, 0, 1, 0]
+    })
+
+
+if __name__ == '__main__':
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for name, builder in [('shap_mini', shap_mini), ('remediator_mini', remediator_mini)]:
+        path = os.path.join(DATA_DIR, f'{name}.parquet')
+        builder().to_parquet(path, index=False)
+        print(f'wrote {path}')